@@ -25,7 +25,7 @@ class ProgressWorker(QObject):
     progress_updated = pyqtSignal(int, str)
     generation_finished = pyqtSignal(bool, str)  # Success status and output path
     
-    def __init__(self, video_generator, image_items, output_path, aspect_ratio, frame_rate, transition_overlap, quality):
+    def __init__(self, video_generator, image_items, output_path, aspect_ratio, frame_rate, transition_overlap, quality, hwaccel):
         super().__init__()
         self.video_generator = video_generator
         self.image_items = image_items
@@ -34,6 +34,7 @@ class ProgressWorker(QObject):
         self.frame_rate = frame_rate
         self.transition_overlap = transition_overlap
         self.quality = quality
+        self.hwaccel = hwaccel
         self.success = False
         
     def run(self):
@@ -53,7 +54,8 @@ class ProgressWorker(QObject):
                 self.aspect_ratio,
                 self.frame_rate,
                 self.transition_overlap,
-                self.quality
+                self.quality,
+                self.hwaccel
             )
             
             # Emit the finished signal with success status and output path
@@ -294,10 +296,16 @@ class MainWindow(QMainWindow):
         self.output_quality.addItems(["Low", "Medium", "High", "Very High"])
         self.output_quality.setCurrentIndex(2)  # Default to High
         
+        # Encoder (hardware acceleration)
+        self.encoder = QComboBox()
+        self.encoder.addItems(["Auto", "Software", "NVENC", "QSV", "AMF", "VAAPI", "VideoToolbox"])
+        self.encoder.setToolTip("Auto uses a GPU encoder when available and falls back to software")
+        
         global_layout.addRow("Aspect Ratio:", self.aspect_ratio)
         global_layout.addRow("Frame Rate:", self.frame_rate)
         global_layout.addRow("Transition Overlap:", self.transition_overlap)
         global_layout.addRow("Output Quality:", self.output_quality)
+        global_layout.addRow("Encoder:", self.encoder)
         
         # Global transition and effect settings group
         transition_group = QGroupBox("Global Transition and Effect Settings")
@@ -743,6 +751,7 @@ class MainWindow(QMainWindow):
         frame_rate = self.frame_rate.value()
         transition_overlap = self.transition_overlap.value()
         quality = self.output_quality.currentText()
+        hwaccel = self.encoder.currentText()
         
         try:
             # Create progress dialog
@@ -756,7 +765,8 @@ class MainWindow(QMainWindow):
                 aspect_ratio,
                 frame_rate,
                 transition_overlap,
-                quality
+                quality,
+                hwaccel
             )
             
             # Connect worker signals to dialog slots